@@ -32,14 +32,135 @@ License: MIT
 
 import os
 import sys
-import zipfile
 import shutil
 import argparse
 import subprocess
 import re
+import threading
+import functools
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set
-import tempfile
+from typing import List, Dict, Optional, Tuple, Set, Union, TYPE_CHECKING
+
+# zipfile and concurrent.futures are imported where they are used,
+# so --help, --init-libraries and --add-to-project start without them
+if TYPE_CHECKING:
+    import zipfile
+
+
+# Precompiled patterns shared by the symbol and footprint helpers
+# Top-level symbol names; the lookahead rejects sub-symbols like "PartName_1_1"
+_TOP_SYM_RE = re.compile(r'\(symbol "((?![^"]+_\d+_\d+")[^"]+)"')
+# Captures the file name of a footprint's 3D model path, whichever separator
+# the vendor used, so the rewrite below is a plain template substitution
+_MODEL_RE = re.compile(r'\(model "(?:[^"]*[/\\])?([^"/\\]+)"')
+_MODEL_PATH_TEMPLATE = r'(model "${KICAD_3DMODEL_DIR}/\1"'
+# Symbol metadata shown by extract_symbol_info
+_SYM_RE = re.compile(r'\(symbol\s+"([^"]+)"')
+# The URL may follow other text in the datasheet value, as in "See http://..."
+_DS_RE = re.compile(r'property\s+"Datasheet"\s+"[^"]*?(http[^"]*)"')
+_FP_RE = re.compile(r'property\s+"Footprint"\s+"([^"]+)"')
+
+_SYM_PREFIX = '(symbol "'
+
+_SYM_EXT = '.kicad_sym'
+_FP_EXT = '.kicad_mod'
+_MODEL_EXTS = frozenset({'.step', '.stp', '.stl', '.3d', '.wrl'})
+# Category of each recognized file extension (lowercase)
+_EXT_TO_BUCKET = {_SYM_EXT: 'symbols', _FP_EXT: 'footprints'}
+_EXT_TO_BUCKET.update(dict.fromkeys(_MODEL_EXTS, '3d_models'))
+
+_EMPTY_SYMBOL_LIB_HEADER = b'(kicad_symbol_lib (version 20211014) (generator kicad_symbol_editor)'
+_EMPTY_SYMBOL_LIB = _EMPTY_SYMBOL_LIB_HEADER + b'\n)'
+# Buffer size for streaming copies of zip entries
+_COPY_BUFFER_SIZE = 1 << 20
+# Bytes read per step when scanning a library for symbol names
+_READ_CHUNK_SIZE = 1 << 20
+# Worker threads for copying footprints and 3D models
+_COPY_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+# Bytes read from the end of a library to locate its closing paren
+_SYMBOL_LIB_TAIL_SIZE = 256
+# Default Windows and macOS file systems ignore case, so "ABC.kicad_mod" and
+# "abc.kicad_mod" are the same file there
+_CASE_INSENSITIVE_FS = sys.platform in ('win32', 'darwin')
+
+
+def _symbol_names(content: str) -> List[str]:
+    """Return top-level symbol names, skipping sub-symbols like "PartName_1_1"
+
+    Empty libraries are common, so a plain substring check rules them out
+    before the regex engine is involved at all.
+    """
+    if _SYM_PREFIX not in content:
+        return []
+    return _TOP_SYM_RE.findall(content)
+
+
+@functools.lru_cache(maxsize=512)
+def _symbol_info(symbol_content: str) -> Tuple[str, str, str]:
+    """Return the (name, datasheet, footprint) of symbol content, memoized by content"""
+    fields = []
+    # One scan of the whole buffer per field; each stops at its first match
+    for pattern in (_SYM_RE, _DS_RE, _FP_RE):
+        match = pattern.search(symbol_content)
+        fields.append(match.group(1) if match else '')
+    return tuple(fields)
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF-8 file content, normalizing Windows line endings"""
+    text = data.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n')
+    return text
+
+
+def _parse_symlib(content: str) -> Tuple[int, int, List[str]]:
+    """Locate the symbol definitions in .kicad_sym content
+
+    Returns (start, end, names) where content[start:end] holds the symbol
+    definitions without the (kicad_symbol_lib ...) wrapper and names lists
+    the top-level symbols. start == end when there is nothing to copy.
+    """
+    if not content.startswith('(kicad_symbol_lib'):
+        return 0, len(content), _symbol_names(content)
+    
+    start = content.find(_SYM_PREFIX)
+    end = content.rfind(')')
+    if start == -1 or end < start:
+        return 0, 0, []
+    
+    # The wrapper header holds no symbols, so the name scan starts at the body
+    names = _TOP_SYM_RE.findall(content, start, end)
+    return start, end, names
+
+
+def _dir_names(path: Path) -> Set[str]:
+    """Return the names of all entries in a directory with a single listing"""
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries}
+
+
+def _file_key(file_name: str) -> str:
+    """Return the key under which a file name is compared with other files"""
+    return file_name.casefold() if _CASE_INSENSITIVE_FS else file_name
+
+
+def _last_per_name(members: 'List[zipfile.ZipInfo]') -> 'List[zipfile.ZipInfo]':
+    """Keep only the last zip member for each file name, as a serial copy would leave it"""
+    return list({_file_key(_member_name(info)): info for info in members}.values())
+
+
+def _extract_lib_name(line: str) -> Optional[str]:
+    """Return the library name from a '(lib (name "...") ...)' table line"""
+    if '(lib ' not in line or '(name "' not in line:
+        return None
+    lib_name = line.partition('(name "')[2].partition('"')[0]
+    return lib_name or None
+
+
+def _member_name(info: 'zipfile.ZipInfo') -> str:
+    """Return the file name of a zip member, ignoring its folders"""
+    return info.filename.replace('\\', '/').rsplit('/', 1)[-1]
 
 
 class LibraryManager:
@@ -130,6 +251,32 @@ class LibraryManager:
                 "description": "Standoffs, heatsinks, mounting hardware, test points"
             }
         }
+        
+        # Library table names and paths, derived once from the file and directory names
+        for lib_info in self.libraries.values():
+            lib_info['sym_name'] = lib_info['sym_file'][:-len(_SYM_EXT)]
+            lib_info['fp_name'] = lib_info['fp_dir'][:-len('.pretty')]
+            lib_info['sym_path'] = self.lib_sym_path / lib_info['sym_file']
+            lib_info['fp_path'] = self.lib_fp_path / lib_info['fp_dir']
+        
+        # Menu order of the library keys, used to map menu numbers to libraries
+        self._library_keys: Tuple[str, ...] = tuple(self.libraries)
+        
+        # Names already present per library, loaded on first use and kept
+        # up to date as components are added
+        self._existing_symbols_cache: Dict[str, Set[str]] = {}
+        self._existing_footprints_cache: Dict[str, Set[str]] = {}
+        
+        # Serializes console output from worker threads
+        self._output_lock = threading.RLock()
+        
+        # Files written since the last commit, staged by path instead of 'git add .'
+        self._dirty_paths: Set[Path] = set()
+    
+    def _log(self, message: str) -> None:
+        """Print a message without interleaving output from worker threads"""
+        with self._output_lock:
+            print(message)
     
     def display_library_menu(self, component_name: str = None, datasheet: str = None, footprint: str = None) -> None:
         """Display the library selection menu"""
@@ -164,7 +311,7 @@ class LibraryManager:
                 if choice_num == 0:
                     return None
                 elif 1 <= choice_num <= len(self.libraries):
-                    return list(self.libraries.keys())[choice_num - 1]
+                    return self._library_keys[choice_num - 1]
                 else:
                     print(f"Invalid choice. Please enter a number between 0 and {len(self.libraries)}")
             except ValueError:
@@ -173,224 +320,306 @@ class LibraryManager:
                 print("\n⚠ Operation cancelled by user.")
                 return None
     
-    def extract_zip_contents(self, zip_path: str) -> Tuple[Path, List[str]]:
-        """Extract zip file and return temporary directory and file list"""
-        temp_dir = Path(tempfile.mkdtemp())
+    def open_zip(self, zip_path: str) -> 'zipfile.ZipFile':
+        """Open a zip file for reading, exiting if it cannot be read"""
+        import zipfile
         
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            
-            # Get list of extracted files
-            extracted_files = []
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    extracted_files.append(Path(root) / file)
-            
-            return temp_dir, extracted_files
+            return zipfile.ZipFile(zip_path, 'r')
+        except FileNotFoundError:
+            print(f"Error: File not found: {zip_path}")
+            sys.exit(1)
         except zipfile.BadZipFile:
             print(f"Error: {zip_path} is not a valid zip file")
             sys.exit(1)
         except Exception as e:
-            print(f"Error extracting zip file: {e}")
+            print(f"Error opening zip file: {e}")
             sys.exit(1)
     
-    def categorize_files(self, files: List[Path]) -> Dict[str, List[Path]]:
-        """Categorize files by type (symbols, footprints, 3d_models)"""
+    def _categorize_file(self, file_name: str) -> Optional[str]:
+        """Return the category of a file name, or None if it is not a KiCad file"""
+        bucket = _EXT_TO_BUCKET.get(os.path.splitext(file_name)[1].lower())
+        
+        # Fall back to the name only when the extension is not recognized
+        if bucket is None and '3d' in file_name.lower():
+            return '3d_models'
+        return bucket
+    
+    def categorize_zip_members(self, zip_ref: 'zipfile.ZipFile') -> 'Dict[str, List[zipfile.ZipInfo]]':
+        """Categorize the file entries of a zip by type without extracting them"""
         categorized = {
             'symbols': [],
             'footprints': [],
             '3d_models': []
         }
         
-        for file_path in files:
-            file_ext = file_path.suffix.lower()
-            file_name = file_path.name.lower()
-            
-            if file_ext == '.kicad_sym':
-                categorized['symbols'].append(file_path)
-            elif file_ext == '.kicad_mod':
-                categorized['footprints'].append(file_path)
-            elif file_ext in ['.step', '.stp', '.stl', '.3d'] or '3d' in file_name:
-                categorized['3d_models'].append(file_path)
+        for info in zip_ref.infolist():
+            # Directories and empty files carry nothing worth importing
+            if info.is_dir() or not info.file_size:
+                continue
+            category = self._categorize_file(_member_name(info))
+            if category:
+                categorized[category].append(info)
         
         return categorized
     
     def get_existing_symbols(self, library_key: str) -> Set[str]:
         """Get set of symbol names that already exist in a library"""
+        if library_key in self._existing_symbols_cache:
+            return self._existing_symbols_cache[library_key]
+        
         existing_symbols = set()
-        target_sym_file = self.lib_sym_path / self.libraries[library_key]['sym_file']
+        target_sym_file = self.libraries[library_key]['sym_path']
         
         if target_sym_file.exists():
             try:
-                with open(target_sym_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                # Find all symbol names using regex
-                matches = re.findall(r'\(symbol "([^"]+)"', content)
-                # Filter out sub-symbols (contain underscore followed by number at end)
-                for match in matches:
-                    if not re.match(r'.+_\d+_\d+$', match):
-                        existing_symbols.add(match)
+                # Scan in 1 MiB chunks cut at line boundaries so large libraries
+                # are never held in memory as a whole (names never span lines)
+                # Raw bytes are decoded per chunk; a newline byte is never part
+                # of a multi-byte UTF-8 sequence, so cutting there is safe
+                carry = b''
+                with open(target_sym_file, 'rb') as f:
+                    while True:
+                        chunk = f.read(_READ_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        data = carry + chunk
+                        cut = data.rfind(b'\n') + 1
+                        existing_symbols.update(_symbol_names(data[:cut].decode('utf-8')))
+                        carry = data[cut:]
+                existing_symbols.update(_symbol_names(carry.decode('utf-8')))
             except Exception:
-                pass
+                # Not cached, so the next call scans the library again
+                return existing_symbols
         
+        self._existing_symbols_cache[library_key] = existing_symbols
         return existing_symbols
     
+    def get_existing_footprints(self, library_key: str) -> Set[str]:
+        """Get set of footprint file names (as _file_key keys) that already exist in a library"""
+        if library_key in self._existing_footprints_cache:
+            return self._existing_footprints_cache[library_key]
+        
+        existing_footprints = set()
+        target_fp_dir = self.libraries[library_key]['fp_path']
+        
+        if target_fp_dir.is_dir():
+            # DirEntry.is_file() uses the d_type from the listing, no extra stat
+            with os.scandir(target_fp_dir) as entries:
+                existing_footprints.update(_file_key(entry.name) for entry in entries
+                                           if entry.is_file())
+        
+        self._existing_footprints_cache[library_key] = existing_footprints
+        return existing_footprints
+    
     def extract_symbol_names(self, symbol_content: str) -> List[str]:
         """Extract symbol names from symbol file content"""
-        names = []
-        matches = re.findall(r'\(symbol "([^"]+)"', symbol_content)
-        for match in matches:
-            # Skip sub-symbols (e.g., "PartName_1_1")
-            if not re.match(r'.+_\d+_\d+$', match):
-                names.append(match)
-        return names
-    
-    def add_symbol_to_library(self, symbol_file: Path, library_key: str) -> bool:
-        """Add symbol to the specified library with duplicate detection"""
-        try:
-            target_sym_file = self.lib_sym_path / self.libraries[library_key]['sym_file']
-            
-            # Read the symbol file content
-            with open(symbol_file, 'r', encoding='utf-8') as f:
-                symbol_content = f.read().strip()
-            
-            # Check for duplicates
-            existing_symbols = self.get_existing_symbols(library_key)
-            new_symbol_names = self.extract_symbol_names(symbol_content)
-            
-            duplicates = [name for name in new_symbol_names if name in existing_symbols]
-            if duplicates:
-                print(f"⚠ Symbol(s) already exist in {library_key}: {', '.join(duplicates)}")
-                while True:
-                    choice = input("  Overwrite? (y/n): ").strip().lower()
-                    if choice in ['n', 'no']:
-                        print(f"  - Skipped {symbol_file.name}")
-                        return True
-                    elif choice in ['y', 'yes']:
-                        break
-                    else:
-                        print("  Please enter 'y' or 'n'")
-            
-            # Extract symbols
-            symbols_to_add = ""
-            
-            if symbol_content.startswith('(kicad_symbol_lib'):
-                first_paren = symbol_content.find('(symbol "')
-                if first_paren == -1:
-                    return True
+        return _symbol_names(symbol_content)
+    
+    def _confirm_overwrite(self) -> bool:
+        """Ask whether an existing symbol or footprint should be overwritten"""
+        while True:
+            choice = input("  Overwrite? (y/n): ").strip().lower()
+            if choice in ['y', 'yes']:
+                return True
+            elif choice in ['n', 'no']:
+                return False
+            else:
+                print("  Please enter 'y' or 'n'")
+    
+    def add_symbol_to_library(self, symbol_file: Union[Path, bytes], library_key: str,
+                              name: str = "symbol data") -> bool:
+        """Add symbol (a file or its raw content) to the specified library with duplicate detection"""
+        if isinstance(symbol_file, Path):
+            name = symbol_file.name
+            try:
+                symbol_file = symbol_file.read_bytes()
+            except Exception as e:
+                print(f"✗ Error adding symbol {name}: {e}")
+                return False
+        return self.add_symbols_to_library([(name, symbol_file)], library_key)
+    
+    def add_symbols_to_library(self, symbols: List[Tuple[str, bytes]], library_key: str) -> bool:
+        """Add symbols given as (file name, raw content) pairs to a library with a single write"""
+        target_sym_file = self.libraries[library_key]['sym_path']
+        existing_symbols = self.get_existing_symbols(library_key)
+        pending_names = set()
+        added_files = []
+        bodies = []
+        success = True
+        
+        for symbol_name, symbol_data in symbols:
+            try:
+                symbol_content = _decode_text(symbol_data).strip()
                 
-                last_paren = symbol_content.rfind(')')
-                if last_paren == -1:
-                    return True
+                # Check for duplicates, including symbols queued from earlier files
+                body_start, body_end, new_symbol_names = _parse_symlib(symbol_content)
                 
-                symbols_to_add = symbol_content[first_paren:last_paren]
-            else:
-                symbols_to_add = symbol_content
-            
-            # Read existing library content
-            existing_content = ""
-            if target_sym_file.exists():
-                with open(target_sym_file, 'r', encoding='utf-8') as f:
-                    existing_content = f.read().strip()
-            
-            # Prepare the updated library content
-            if existing_content and existing_content != '(kicad_symbol_lib (version 20211014) (generator kicad_symbol_editor)\n)':
-                if existing_content.endswith(')'):
-                    content_without_close = existing_content[:-1]
-                    updated_content = f"{content_without_close}\n{symbols_to_add}\n)"
-                else:
-                    updated_content = f"{existing_content}\n{symbols_to_add}"
-            else:
-                updated_content = f"""(kicad_symbol_lib (version 20211014) (generator kicad_symbol_editor)
-{symbols_to_add}
-)"""
-            
-            # Write the updated content
-            with open(target_sym_file, 'w', encoding='utf-8') as f:
-                f.write(updated_content)
-            
-            print(f"✓ Added symbol(s) from {symbol_file.name} to {library_key}")
-            return True
-            
+                duplicates = [name for name in new_symbol_names
+                              if name in existing_symbols or name in pending_names]
+                if duplicates:
+                    print(f"⚠ Symbol(s) already exist in {library_key}: {', '.join(duplicates)}")
+                    if not self._confirm_overwrite():
+                        print(f"  - Skipped {symbol_name}")
+                        continue
+                
+                if body_start == body_end:
+                    continue
+                
+                bodies.append(symbol_content[body_start:body_end])
+                pending_names.update(new_symbol_names)
+                added_files.append(symbol_name)
+                
+            except Exception as e:
+                print(f"✗ Error adding symbol {symbol_name}: {e}")
+                success = False
+        
+        if not bodies:
+            return success
+        
+        try:
+            self._append_to_symbol_library(target_sym_file, bodies)
         except Exception as e:
-            print(f"✗ Error adding symbol {symbol_file.name}: {e}")
+            print(f"✗ Error writing symbols to {library_key}: {e}")
             return False
+        existing_symbols.update(pending_names)
+        self._dirty_paths.add(target_sym_file)
+        
+        for symbol_name in added_files:
+            print(f"✓ Added symbol(s) from {symbol_name} to {library_key}")
+        return success
     
-    def update_footprint_3d_path(self, footprint_file: Path) -> None:
-        """Update 3D model path in footprint to use library's 3d_models folder"""
-        try:
-            with open(footprint_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Find and update 3D model paths
-            # Pattern: (model "path/to/model.step"
-            def replace_model_path(match):
-                original_path = match.group(1)
-                model_name = Path(original_path).name
-                # Use ${KIPRJMOD}/lib/3d_models/ or relative path
-                new_path = f"${{KICAD_3DMODEL_DIR}}/{model_name}"
-                return f'(model "{new_path}"'
-            
-            updated_content = re.sub(
-                r'\(model "([^"]+)"',
-                replace_model_path,
-                content
-            )
-            
-            if updated_content != content:
-                with open(footprint_file, 'w', encoding='utf-8') as f:
-                    f.write(updated_content)
-                print(f"  → Updated 3D model path in {footprint_file.name}")
+    def _append_to_symbol_library(self, target_sym_file: Path, bodies: List[str]) -> None:
+        """Append symbol definitions before the closing paren of a library file
+        
+        Only the tail of an existing library is read and rewritten, so the
+        cost of an append does not grow with the size of the library. The
+        bodies are written one by one rather than joined into one string.
+        """
+        if target_sym_file.exists():
+            with open(target_sym_file, 'rb+') as f:
+                size = f.seek(0, os.SEEK_END)
+                tail_start = max(0, size - _SYMBOL_LIB_TAIL_SIZE)
+                f.seek(tail_start)
+                tail = f.read().rstrip()
+                if not tail and tail_start > 0:
+                    # Unusually long trailing whitespace, fall back to the whole file
+                    tail_start = 0
+                    f.seek(0)
+                    tail = f.read().rstrip()
                 
-        except Exception as e:
-            # Non-fatal error, just skip
-            pass
+                is_empty_library = tail_start == 0 and tail.strip().replace(b'\r\n', b'\n') in (b'', _EMPTY_SYMBOL_LIB)
+                if not is_empty_library:
+                    # Keep the library's own line endings (CRLF when saved on Windows)
+                    newline = b'\r\n' if b'\r\n' in tail else b'\n'
+                    has_close = tail.endswith(b')')
+                    f.seek(tail_start + len(tail) - (1 if has_close else 0))
+                    f.truncate()
+                    f.write(newline)
+                    self._write_symbol_bodies(f, bodies, newline)
+                    if has_close:
+                        f.write(newline + b')')
+                    return
+        
+        with open(target_sym_file, 'wb') as f:
+            f.write(_EMPTY_SYMBOL_LIB_HEADER)
+            f.write(b'\n')
+            self._write_symbol_bodies(f, bodies)
+            f.write(b'\n)')
+    
+    def _write_symbol_bodies(self, f, bodies: List[str], newline: bytes = b'\n') -> None:
+        """Write symbol bodies separated by a blank line, using the given line ending"""
+        for i, body in enumerate(bodies):
+            if i:
+                f.write(newline * 2)
+            data = body.encode('utf-8')
+            if newline != b'\n':
+                data = data.replace(b'\n', newline)
+            f.write(data)
+    
+    def _update_3d_paths(self, data: bytes, footprint_name: str) -> bytes:
+        """Return footprint content with 3D model paths rewritten, or data itself if unchanged"""
+        try:
+            content = data.decode('utf-8')
+        except UnicodeDecodeError:
+            # Non-fatal error, leave the footprint as it is
+            return data
+        
+        # Point every (model "path/to/model.step" at the shared 3D model dir
+        updated_content = _MODEL_RE.sub(_MODEL_PATH_TEMPLATE, content)
+        
+        if updated_content == content:
+            return data
+        self._log(f"  → Updated 3D model path in {footprint_name}")
+        return updated_content.encode('utf-8')
+    
+    def add_footprint_to_library(self, zip_ref: 'zipfile.ZipFile', info: 'zipfile.ZipInfo',
+                                 library_key: str) -> bool:
+        """Add footprint from a zip entry to the specified library"""
+        if not self._confirm_footprint(_member_name(info), library_key, set()):
+            return True
+        return self._write_footprint(zip_ref, info, library_key)
+    
+    def _confirm_footprint(self, footprint_name: str, library_key: str,
+                           pending_names: Set[str]) -> bool:
+        """Return whether a footprint should be written, asking first if it already exists"""
+        # Footprints confirmed earlier in the same batch count as existing
+        key = _file_key(footprint_name)
+        if key in self.get_existing_footprints(library_key) or key in pending_names:
+            print(f"⚠ Footprint already exists: {footprint_name}")
+            try:
+                overwrite = self._confirm_overwrite()
+            except EOFError as e:
+                # No answer available (stdin closed), so the footprint is skipped
+                print(f"✗ Error adding footprint {footprint_name}: {e}")
+                return False
+            if not overwrite:
+                print(f"  - Skipped {footprint_name}")
+                return False
+        pending_names.add(key)
+        return True
     
-    def add_footprint_to_library(self, footprint_file: Path, library_key: str) -> bool:
-        """Add footprint to the specified library"""
+    def _write_footprint(self, zip_ref: 'zipfile.ZipFile', info: 'zipfile.ZipInfo',
+                         library_key: str) -> bool:
+        """Write a confirmed footprint from a zip entry into the specified library"""
+        footprint_name = _member_name(info)
         try:
-            target_fp_dir = self.lib_fp_path / self.libraries[library_key]['fp_dir']
+            target_fp_dir = self.libraries[library_key]['fp_path']
             target_fp_dir.mkdir(parents=True, exist_ok=True)
             
-            target_file = target_fp_dir / footprint_file.name
-            
-            # Check for duplicate
-            if target_file.exists():
-                print(f"⚠ Footprint already exists: {footprint_file.name}")
-                while True:
-                    choice = input("  Overwrite? (y/n): ").strip().lower()
-                    if choice in ['n', 'no']:
-                        print(f"  - Skipped {footprint_file.name}")
-                        return True
-                    elif choice in ['y', 'yes']:
-                        break
-                    else:
-                        print("  Please enter 'y' or 'n'")
+            target_file = target_fp_dir / footprint_name
             
-            shutil.copy2(footprint_file, target_file)
+            # Footprints are small, so the 3D model path is rewritten in memory
+            # and the file is written once, straight from the zip
+            data = self._update_3d_paths(zip_ref.read(info), footprint_name)
+            with open(target_file, 'wb') as f:
+                f.write(data)
             
-            # Update 3D model path in the copied footprint
-            self.update_footprint_3d_path(target_file)
-            
-            print(f"✓ Added footprint {footprint_file.name} to {library_key}")
+            # Only footprints that reached the disk are remembered as existing
+            self.get_existing_footprints(library_key).add(_file_key(footprint_name))
+            self._dirty_paths.add(target_file)
+            self._log(f"✓ Added footprint {footprint_name} to {library_key}")
             return True
             
         except Exception as e:
-            print(f"✗ Error adding footprint {footprint_file.name}: {e}")
+            self._log(f"✗ Error adding footprint {footprint_name}: {e}")
             return False
     
-    def add_3d_model(self, model_file: Path) -> bool:
-        """Add 3D model to the 3d_models directory"""
+    def add_3d_model(self, zip_ref: 'zipfile.ZipFile', info: 'zipfile.ZipInfo') -> bool:
+        """Add 3D model from a zip entry to the 3d_models directory"""
+        model_name = _member_name(info)
         try:
-            target_file = self.models_3d_path / model_file.name
-            shutil.copy2(model_file, target_file)
+            target_file = self.models_3d_path / model_name
+            # Stream straight to the destination; small models take a single read
+            with zip_ref.open(info) as src, open(target_file, 'wb') as dst:
+                shutil.copyfileobj(src, dst, min(info.file_size, _COPY_BUFFER_SIZE))
             
-            print(f"✓ Added 3D model {model_file.name}")
+            self._dirty_paths.add(target_file)
+            self._log(f"✓ Added 3D model {model_name}")
             return True
             
         except Exception as e:
-            print(f"✗ Error adding 3D model {model_file.name}: {e}")
+            self._log(f"✗ Error adding 3D model {model_name}: {e}")
             return False
     
     def display_project_library_menu(self) -> None:
@@ -415,7 +644,7 @@ class LibraryManager:
                 choice = input(f"\nEnter your choice (0-{len(self.libraries)}, comma-separated for multiple): ").strip()
                 
                 if choice == "0":
-                    return list(self.libraries.keys())
+                    return list(self._library_keys)
                 
                 choices = [c.strip() for c in choice.split(',')]
                 valid_choices = []
@@ -423,7 +652,7 @@ class LibraryManager:
                 for choice_str in choices:
                     choice_num = int(choice_str)
                     if 1 <= choice_num <= len(self.libraries):
-                        valid_choices.append(list(self.libraries.keys())[choice_num - 1])
+                        valid_choices.append(self._library_keys[choice_num - 1])
                     else:
                         print(f"Invalid choice: {choice_str}")
                         break
@@ -472,26 +701,19 @@ class LibraryManager:
             existing_entries = set()
             table_content = ""
             if sym_lib_table.exists():
-                with open(sym_lib_table, 'r', encoding='utf-8') as f:
-                    table_content = f.read()
-                    for line in table_content.split('\n'):
-                        if 'name=' in line and 'uri=' in line:
-                            try:
-                                name_start = line.find('name="') + 6
-                                name_end = line.find('"', name_start)
-                                if name_start > 5 and name_end > name_start:
-                                    lib_name = line[name_start:name_end]
-                                    existing_entries.add(lib_name)
-                            except:
-                                pass
+                table_content = _decode_text(sym_lib_table.read_bytes())
+                for line in table_content.split('\n'):
+                    lib_name = _extract_lib_name(line)
+                    if lib_name:
+                        existing_entries.add(lib_name)
             
             new_entries = []
             for lib_key in selected_libraries:
                 lib_info = self.libraries[lib_key]
-                lib_name = lib_info['sym_file'].replace('.kicad_sym', '')
+                lib_name = lib_info['sym_name']
                 
                 if lib_name not in existing_entries:
-                    lib_path = self.lib_sym_path / lib_info['sym_file']
+                    lib_path = lib_info['sym_path']
                     relative_path = os.path.relpath(lib_path, sym_lib_table.parent)
                     relative_path = relative_path.replace('\\', '/')
                     
@@ -503,20 +725,19 @@ class LibraryManager:
             
             if new_entries:
                 if table_content.strip():
-                    lines = table_content.split('\n')
-                    last_closing_idx = -1
-                    for i in range(len(lines) - 1, -1, -1):
-                        if ')' in lines[i] and not lines[i].strip().startswith('('):
-                            last_closing_idx = i
-                            break
-                    
-                    if last_closing_idx >= 0:
-                        lines.insert(last_closing_idx, '\n'.join(new_entries))
+                    # Insert the new entries before the table's closing paren
+                    close_pos = table_content.rfind(')')
+                    entries_text = '\n'.join(new_entries)
+                    if close_pos >= 0:
+                        head = table_content[:close_pos].rstrip(' \t')
+                        if not head.endswith('\n'):
+                            head += '\n'
+                        updated_content = f"{head}{entries_text}\n{table_content[close_pos:]}"
                     else:
-                        lines.extend([''] + new_entries)
+                        updated_content = f"{table_content.rstrip()}\n\n{entries_text}"
                     
                     with open(sym_lib_table, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(lines))
+                        f.write(updated_content)
                 else:
                     table_structure = f"""(sym_lib_table
   (version 7)
@@ -538,26 +759,19 @@ class LibraryManager:
             existing_entries = set()
             table_content = ""
             if fp_lib_table.exists():
-                with open(fp_lib_table, 'r', encoding='utf-8') as f:
-                    table_content = f.read()
-                    for line in table_content.split('\n'):
-                        if 'name=' in line and 'uri=' in line:
-                            try:
-                                name_start = line.find('name="') + 6
-                                name_end = line.find('"', name_start)
-                                if name_start > 5 and name_end > name_start:
-                                    lib_name = line[name_start:name_end]
-                                    existing_entries.add(lib_name)
-                            except:
-                                pass
+                table_content = _decode_text(fp_lib_table.read_bytes())
+                for line in table_content.split('\n'):
+                    lib_name = _extract_lib_name(line)
+                    if lib_name:
+                        existing_entries.add(lib_name)
             
             new_entries = []
             for lib_key in selected_libraries:
                 lib_info = self.libraries[lib_key]
-                lib_name = lib_info['fp_dir'].replace('.pretty', '')
+                lib_name = lib_info['fp_name']
                 
                 if lib_name not in existing_entries:
-                    lib_path = self.lib_fp_path / lib_info['fp_dir']
+                    lib_path = lib_info['fp_path']
                     relative_path = os.path.relpath(lib_path, fp_lib_table.parent)
                     relative_path = relative_path.replace('\\', '/')
                     
@@ -569,20 +783,19 @@ class LibraryManager:
             
             if new_entries:
                 if table_content.strip():
-                    lines = table_content.split('\n')
-                    last_closing_idx = -1
-                    for i in range(len(lines) - 1, -1, -1):
-                        if ')' in lines[i] and not lines[i].strip().startswith('('):
-                            last_closing_idx = i
-                            break
-                    
-                    if last_closing_idx >= 0:
-                        lines.insert(last_closing_idx, '\n'.join(new_entries))
+                    # Insert the new entries before the table's closing paren
+                    close_pos = table_content.rfind(')')
+                    entries_text = '\n'.join(new_entries)
+                    if close_pos >= 0:
+                        head = table_content[:close_pos].rstrip(' \t')
+                        if not head.endswith('\n'):
+                            head += '\n'
+                        updated_content = f"{head}{entries_text}\n{table_content[close_pos:]}"
                     else:
-                        lines.extend([''] + new_entries)
+                        updated_content = f"{table_content.rstrip()}\n\n{entries_text}"
                     
                     with open(fp_lib_table, 'w', encoding='utf-8') as f:
-                        f.write('\n'.join(lines))
+                        f.write(updated_content)
                 else:
                     table_structure = f"""(fp_lib_table
   (version 7)
@@ -598,34 +811,66 @@ class LibraryManager:
         except Exception as e:
             print(f"  ✗ Error updating footprint library table: {e}")
     
-    def commit_changes(self, zip_filename: str) -> bool:
-        """Commit changes with automated message"""
-        try:
-            subprocess.run(['git', 'add', '.'], cwd=self.base_path, check=True)
-            commit_msg = f"Add components from {zip_filename}"
-            subprocess.run(['git', 'commit', '-m', commit_msg], cwd=self.base_path, check=True)
-            print(f"✓ Committed changes: {commit_msg}")
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Error committing changes: {e}")
-            return False
-        except FileNotFoundError:
-            print("✗ Git not found. Please ensure git is installed.")
-            return False
+    def commit_changes(self, zip_filename: str, push: bool = False,
+                       stage_all: bool = False) -> bool:
+        """Commit changes with automated message, optionally pushing them"""
+        return self._git_publish(f"Add components from {zip_filename}", push=push,
+                                 stage_all=stage_all)
     
     def push_changes(self) -> bool:
         """Push changes to remote repository"""
+        return self._git_publish(push=True)
+    
+    def _git_publish(self, commit_msg: Optional[str] = None, push: bool = False,
+                     stage_all: bool = False) -> bool:
+        """Run git add/commit and/or push in sequence, stopping at the first failure"""
         try:
-            subprocess.run(['git', 'push'], cwd=self.base_path, check=True)
-            print("✓ Pushed changes to remote repository")
+            if commit_msg:
+                try:
+                    self._git_add(stage_all)
+                    self._git('commit', '-m', commit_msg, check=True)
+                    self._dirty_paths.clear()
+                except subprocess.CalledProcessError as e:
+                    print(f"✗ Error committing changes: {e}")
+                    return False
+                print(f"✓ Committed changes: {commit_msg}")
+            
+            if push:
+                try:
+                    self._git('push', check=True)
+                except subprocess.CalledProcessError as e:
+                    print(f"✗ Error pushing changes: {e}")
+                    return False
+                print("✓ Pushed changes to remote repository")
+            
             return True
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Error pushing changes: {e}")
-            return False
         except FileNotFoundError:
-            print("✗ Git not found.")
+            print("✗ Git not found. Please ensure git is installed.")
             return False
     
+    def _git(self, *args: str, **kwargs) -> subprocess.CompletedProcess:
+        """Run a git command in the library repository"""
+        # config, add, commit and push take no optional locks, so this has no
+        # effect today; it only matters if read-only commands such as status
+        # or diff are later run through here, which would otherwise refresh
+        # and lock the index as a side effect
+        env = dict(os.environ, GIT_OPTIONAL_LOCKS='0')
+        return subprocess.run(['git', *args], cwd=self.base_path, env=env, **kwargs)
+    
+    def _git_add(self, stage_all: bool = False) -> None:
+        """Stage the files written by this run, or everything if none were recorded and stage_all is set"""
+        if not self._dirty_paths:
+            if stage_all:
+                self._git('add', '.', check=True)
+            return
+        
+        # One git invocation for any number of files; literal pathspecs so
+        # names containing glob characters are not expanded
+        pathspecs = [':(literal)' + os.path.relpath(path, self.base_path).replace('\\', '/')
+                     for path in sorted(self._dirty_paths)]
+        self._git('add', '--pathspec-from-file=-', '--pathspec-file-nul', check=True,
+                  input='\0'.join(pathspecs).encode('utf-8'))
+    
     def initialize_libraries(self) -> bool:
         """Initialize empty library files if they don't exist"""
         try:
@@ -636,27 +881,32 @@ class LibraryManager:
             self.lib_fp_path.mkdir(parents=True, exist_ok=True)
             self.models_3d_path.mkdir(parents=True, exist_ok=True)
             
+            # One listing per directory instead of a stat per library
+            existing_sym_files = _dir_names(self.lib_sym_path)
+            existing_fp_dirs = _dir_names(self.lib_fp_path)
+            
             # Initialize symbol libraries
             for lib_key, lib_info in self.libraries.items():
-                sym_file = self.lib_sym_path / lib_info['sym_file']
-                if not sym_file.exists():
-                    empty_lib_content = """(kicad_symbol_lib (version 20211014) (generator kicad_symbol_editor)
-)"""
-                    with open(sym_file, 'w', encoding='utf-8') as f:
-                        f.write(empty_lib_content)
+                sym_file = lib_info['sym_path']
+                if lib_info['sym_file'] not in existing_sym_files:
+                    with open(sym_file, 'wb') as f:
+                        f.write(_EMPTY_SYMBOL_LIB)
+                    self._dirty_paths.add(sym_file)
                     print(f"  ✓ Created symbol library: {lib_info['sym_file']}")
                 else:
                     print(f"  - Symbol library already exists: {lib_info['sym_file']}")
             
             # Initialize footprint library directories
             for lib_key, lib_info in self.libraries.items():
-                fp_dir = self.lib_fp_path / lib_info['fp_dir']
-                if not fp_dir.exists():
+                fp_dir = lib_info['fp_path']
+                if lib_info['fp_dir'] not in existing_fp_dirs:
                     fp_dir.mkdir(parents=True, exist_ok=True)
                     print(f"  ✓ Created footprint directory: {lib_info['fp_dir']}")
                 else:
                     print(f"  - Footprint directory already exists: {lib_info['fp_dir']}")
             
+            self._configure_git_performance()
+            
             print("✓ Library initialization complete")
             return True
             
@@ -664,6 +914,21 @@ class LibraryManager:
             print(f"✗ Error initializing libraries: {e}")
             return False
     
+    def _configure_git_performance(self) -> None:
+        """Enable git settings that speed up status/add on a repo of many small files"""
+        settings = [('core.untrackedCache', 'true')]
+        # The built-in fsmonitor daemon only exists on Windows and macOS
+        if sys.platform in ('win32', 'darwin'):
+            settings.append(('core.fsmonitor', 'true'))
+        
+        for key, value in settings:
+            try:
+                # Not fatal: the library may not be a git checkout, or git may be too old
+                self._git('config', key, value,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            except FileNotFoundError:
+                return
+    
     def ask_delete_zip_file(self, zip_path: str) -> None:
         """Ask user if they want to delete the zip file after processing"""
         try:
@@ -697,49 +962,29 @@ class LibraryManager:
     
     def extract_symbol_info(self, symbol_content: str) -> Dict[str, str]:
         """Extract symbol information including datasheet and footprint"""
+        name, datasheet, footprint = _symbol_info(symbol_content)
         info = {
-            'name': '',
-            'datasheet': '',
-            'footprint': '',
+            'name': name,
+            'datasheet': datasheet,
+            'footprint': footprint,
             'content': symbol_content
         }
         
-        lines = symbol_content.split('\n')
-        for line in lines:
-            if line.strip().startswith('(symbol "'):
-                name_start = line.find('"') + 1
-                name_end = line.find('"', name_start)
-                if name_start > 0 and name_end > name_start:
-                    info['name'] = line[name_start:name_end]
-            
-            elif 'property "Datasheet"' in line and 'http' in line:
-                url_start = line.find('http')
-                if url_start != -1:
-                    url_end = line.find('"', url_start)
-                    if url_end == -1:
-                        url_end = line.find(')', url_start)
-                    if url_end != -1:
-                        info['datasheet'] = line[url_start:url_end]
-            
-            elif 'property "Footprint"' in line:
-                quotes = [i for i, c in enumerate(line) if c == '"']
-                if len(quotes) >= 4:
-                    info['footprint'] = line[quotes[2]+1:quotes[3]]
-        
         return info
     
     def process_zip_file(self, zip_path: str, add_to_project: bool = False, 
                          commit: bool = False, push: bool = False,
                          library: str = None) -> bool:
         """Main method to process a zip file"""
+        from concurrent.futures import ThreadPoolExecutor
+        
         print(f"\nProcessing: {zip_path}")
         
-        # Extract zip contents
-        temp_dir, files = self.extract_zip_contents(zip_path)
+        zip_ref = self.open_zip(zip_path)
         
         try:
-            # Categorize files
-            categorized = self.categorize_files(files)
+            # Categorize zip entries without extracting them
+            categorized = self.categorize_zip_members(zip_ref)
             
             print(f"\nFound:")
             print(f"  - {len(categorized['symbols'])} symbol file(s)")
@@ -768,26 +1013,56 @@ class LibraryManager:
             
             print(f"\nAdding to library: {selected_library}")
             
-            # Process symbols
-            for symbol_file in categorized['symbols']:
-                self.add_symbol_to_library(symbol_file, selected_library)
+            # Process symbols (read straight from the zip into memory)
+            symbols = []
+            for info in categorized['symbols']:
+                symbol_name = _member_name(info)
+                try:
+                    symbols.append((symbol_name, zip_ref.read(info)))
+                except Exception as e:
+                    # Bad CRC, encrypted member, ...: skip just this entry
+                    print(f"✗ Error adding symbol {symbol_name}: {e}")
+            if symbols:
+                self.add_symbols_to_library(symbols, selected_library)
+            
+            # Duplicate footprints are confirmed here on the main thread, in
+            # archive order, so prompts and Ctrl-C behave as in a serial run
+            pending_footprints = set()
+            footprints = [info for info in categorized['footprints']
+                          if self._confirm_footprint(_member_name(info), selected_library,
+                                                     pending_footprints)]
             
-            # Process footprints
-            for footprint_file in categorized['footprints']:
-                self.add_footprint_to_library(footprint_file, selected_library)
+            # Members from different folders can share a file name; writing
+            # them concurrently would interleave, so only the last one is kept
+            footprints = _last_per_name(footprints)
+            models = _last_per_name(categorized['3d_models'])
             
-            # Process 3D models
-            for model_file in categorized['3d_models']:
-                self.add_3d_model(model_file)
+            # Write footprints and 3D models (independent files inflated
+            # straight from the zip, so they run in parallel; symbols above
+            # all target one file)
+            with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+                futures = [executor.submit(self._write_footprint, zip_ref, info, selected_library)
+                           for info in footprints]
+                futures.extend(executor.submit(self.add_3d_model, zip_ref, info)
+                               for info in models)
+                for future in futures:
+                    future.result()
+            
+            # Release the zip before it may be deleted below
+            zip_ref.close()
             
             # Update project settings if requested
             if add_to_project:
                 self.update_project_settings()
             
-            # Git operations
+            # Git operations (a run that wrote nothing has nothing to commit,
+            # and staging everything would sweep in unrelated files)
+            if commit and not self._dirty_paths:
+                print("\n- No library files were written. Skipping commit.")
+                commit = False
             if commit:
-                self.commit_changes(Path(zip_path).name)
-            if push:
+                self.commit_changes(Path(zip_path).name, push=push)
+            elif push:
                 self.push_changes()
             
             # Cleanup
@@ -797,8 +1072,7 @@ class LibraryManager:
             return True
             
         finally:
-            # Clean up temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            zip_ref.close()
 
 
 def main():
@@ -848,8 +1122,8 @@ Library Categories:
     if args.init_libraries:
         manager.initialize_libraries()
         if args.commit:
-            manager.commit_changes("library initialization")
-        if args.push:
+            manager.commit_changes("library initialization", push=args.push, stage_all=True)
+        elif args.push:
             manager.push_changes()
         return
     
@@ -860,10 +1134,6 @@ Library Categories:
     
     # Process zip file
     if args.zip_file:
-        if not Path(args.zip_file).exists():
-            print(f"Error: File not found: {args.zip_file}")
-            sys.exit(1)
-        
         manager.process_zip_file(
             args.zip_file,
             add_to_project=args.add_to_project,